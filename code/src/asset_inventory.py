@@ -13,7 +13,7 @@
 @Desc    :  资产清单工具
 """
 from decimal import Decimal
-from typing import List, Any
+from typing import List, Any, NamedTuple
 
 from loguru import logger
 
@@ -23,6 +23,16 @@ from institutions.money_code import MoneyCode
 from utils.file_parse import parse_yaml_file, write_yaml_file
 
 
+class AssetProfitLossSituation(NamedTuple):
+    """单个资产本月的盈亏情况"""
+    name: str
+    money_code: str
+    # 原币种的本月账户余额, 取自配置
+    current_account_balance: float | int
+    current_account_balance_in_rmb: Decimal
+    this_month_profit_loss_situation_in_rmb: Decimal
+
+
 class AssetInventory:
     """资产清单工具类"""
 
@@ -39,17 +49,19 @@ class AssetInventory:
         """
 
         cal_next_month_asset_config_dict = {}
+        rmb_exchange_rate_dict = self.__build_rmb_exchange_rate_dict()
 
         for asset_type_en_str in self.assert_inventory_config:
-            asset_type = AssetType.covert_from_en_str(asset_type_en_str)
+            asset_type = AssetType.convert_from_en_str(asset_type_en_str)
             if asset_type is None:
                 logger.error("资产类型 {} 不存在", asset_type_en_str)
                 continue
             logger.info("开始计算资产类型: {}", asset_type.cn_name)
-            asset_profit_loss_situation_list = self.__calculate_this_month_asset_profit_loss_situation(asset_type,
-                                                                                                       self.assert_inventory_config[
-                                                                                                           asset_type_en_str])
-            self.__calculate_this_month_total_asset_balance(asset_type, asset_profit_loss_situation_list)
+            _, total_profit_loss_situation_in_rmb, total_account_balance_in_rmb = \
+                self.__calculate_this_month_asset_profit_loss_situation(
+                    asset_type, self.assert_inventory_config[asset_type_en_str], rmb_exchange_rate_dict)
+            logger.info("本月{}总盈亏情况:{}, 当前总人民币金额:{}", asset_type.cn_name,
+                        str(round(total_profit_loss_situation_in_rmb, 2)), str(round(total_account_balance_in_rmb, 2)))
             next_month_asset_config_list = self.__rebuild_next_month_asset_config(asset_type,
                                                                                   self.assert_inventory_config[
                                                                                       asset_type_en_str])
@@ -57,86 +69,92 @@ class AssetInventory:
 
         return cal_next_month_asset_config_dict
 
-    def __calculate_this_month_asset_profit_loss_situation(self, assert_type: AssetType,
-                                                           assert_config_list: List[dict[str, Any]]) -> List[
-        dict[str, Any]]:
-        """计算资产盈亏情况
+    def __build_rmb_exchange_rate_dict(self) -> dict[str, Decimal]:
+        """为资产清单中出现的每种货币解析一次兑人民币汇率
+
+        Returns:
+            dict[str, Decimal]: 货币代码字符串 -> 兑人民币汇率
+        """
+        rmb_exchange_rate_dict = {}
+
+        for asset_type_en_str, assert_config_list in self.assert_inventory_config.items():
+            if not isinstance(assert_config_list, list):
+                logger.warning("资产类型 {} 的配置不是列表, 跳过汇率解析", asset_type_en_str)
+                continue
+            for asset_config in assert_config_list:
+                money_code = asset_config["money_code"]
+                if money_code in rmb_exchange_rate_dict:
+                    continue
+                money_code_enum = MoneyCode.convert_from_str(money_code)
+                if money_code_enum is MoneyCode.CNY:
+                    rmb_exchange_rate_dict[money_code] = Decimal("1")
+                else:
+                    rmb_exchange_rate_dict[money_code] = self.boc_hk_exchange_rate.get_exchange_rate(money_code_enum,
+                                                                                                     MoneyCode.CNY)
+        return rmb_exchange_rate_dict
+
+    @staticmethod
+    def __calculate_this_month_asset_profit_loss_situation(assert_type: AssetType,
+                                                           assert_config_list: List[dict[str, Any]],
+                                                           rmb_exchange_rate_dict: dict[str, Decimal]) -> tuple[
+        List[AssetProfitLossSituation], Decimal, Decimal]:
+        """计算资产盈亏情况, 并在同一次遍历中汇总本月总盈亏和总人民币金额
 
         Args:
             assert_type: 资产类型枚举
             assert_config_list: 资产配置列表
+            rmb_exchange_rate_dict: 货币代码字符串 -> 兑人民币汇率
         Returns:
-            List[dict[str, Any]]: 资产盈亏情况
+            tuple[List[AssetProfitLossSituation], Decimal, Decimal]: 资产盈亏情况, 总盈亏, 总人民币金额
         """
 
+        this_month_total_profit_loss_situation_in_rmb = Decimal("0.00")
+        this_month_account_balance_in_rmb = Decimal("0.00")
+
         if not isinstance(assert_config_list, list):
             logger.error("{}资产清单配置文件格式错误", assert_type.cn_name)
             raise ValueError(f"{assert_type.cn_name}资产清单配置文件格式错误")
-        if assert_config_list is None or len(assert_config_list) == 0:
+        if not assert_config_list:
             logger.info("当前没有{}资产", assert_type.cn_name)
-            return None
+            return [], this_month_total_profit_loss_situation_in_rmb, this_month_account_balance_in_rmb
 
         this_month_asset_profit_loss_situation_list = []
 
         for asset_config in assert_config_list:
-            this_month_profit_loss_situation = Decimal(asset_config["current_account_balance"]) - Decimal(
-                asset_config["last_month_account_balance"])
-            this_month_profit_loss_situation_in_rmb = self.__convert_to_rmb_if_needed(this_month_profit_loss_situation,
-                                                                                      asset_config["money_code"])
-
-            current_account_balance_in_rmb = self.__convert_to_rmb_if_needed(
-                Decimal(asset_config["current_account_balance"]), asset_config["money_code"])
-
-            this_month_asset_profit_loss_situation_list.append({
-                "name": asset_config["name"],
-                "money_code": asset_config["money_code"],
-                "last_month_account_balance": asset_config["current_account_balance"],
-                "current_account_balance_in_rmb": str(round(current_account_balance_in_rmb, 2)),
-                "this_month_profit_loss_situation_in_rmb": str(round(this_month_profit_loss_situation_in_rmb, 2))
-            })
-
-        logger.info("本月{}资产盈亏情况:\n{}", assert_type.cn_name, this_month_asset_profit_loss_situation_list)
-        return this_month_asset_profit_loss_situation_list
+            # 每个字段只读取、解析一次
+            money_code = asset_config["money_code"]
+            current_account_balance = asset_config["current_account_balance"]
+            current_account_balance_dec = Decimal(current_account_balance)
+            rmb_exchange_rate = rmb_exchange_rate_dict[money_code]
 
-    def __convert_to_rmb_if_needed(self, account_balance: Decimal, money_code: str) -> Decimal:
-        """如果货币代码不是人民币，则将金额转为人民币
-
-        Args:
-            account_balance: 金额
-            money_code: 货币代码
-        Returns:
-            Decimal: 如果货币代码是人民币，则返回原汇率，否则返回人民币汇率
-        """
-        money_code_enum = MoneyCode.covert_from_str(money_code)
-        if MoneyCode.CNY == money_code_enum:
-            return account_balance
-        return self.boc_hk_exchange_rate.exchange_rate_transfer(money_code_enum, MoneyCode.CNY, float(account_balance))
-
-    @staticmethod
-    def __calculate_this_month_total_asset_balance(assert_type: AssetType,
-                                                   this_month_profit_loss_status_list: List[dict[str, Any]]) -> str:
-        """计算资产本月总的盈亏情况
-
-        Args:
-            assert_type: 资产类型枚举
-            this_month_profit_loss_status_list: 本月资产盈亏情况列表
-        Returns:
-            Decimal: 列表中的资产的盈亏总余额
-        """
-        this_month_total_profit_loss_situation_in_rmb = Decimal("0.00")
-        this_month_account_balance_in_rmb = Decimal("0.00")
-
-        for profit_loss_status in this_month_profit_loss_status_list:
-            this_month_profit_loss_situation_in_rmb = Decimal(
-                str(profit_loss_status["this_month_profit_loss_situation_in_rmb"]))
-            this_month_total_profit_loss_situation_in_rmb += this_month_profit_loss_situation_in_rmb
-            this_month_account_balance_in_rmb += Decimal(
-                str(profit_loss_status["current_account_balance_in_rmb"]))
-
-        this_month_total_profit_loss_situation_in_rmb_str = str(round(this_month_total_profit_loss_situation_in_rmb, 2))
-        logger.info("本月{}总盈亏情况:{}, 当前总人民币金额:{}", assert_type.cn_name,
-                    this_month_total_profit_loss_situation_in_rmb_str, str(round(this_month_account_balance_in_rmb, 2)))
-        return this_month_total_profit_loss_situation_in_rmb_str
+            this_month_profit_loss_situation = current_account_balance_dec - Decimal(
+                asset_config["last_month_account_balance"])
+            this_month_profit_loss_situation_in_rmb = this_month_profit_loss_situation * rmb_exchange_rate
+            current_account_balance_in_rmb = current_account_balance_dec * rmb_exchange_rate
+
+            asset_profit_loss_situation = AssetProfitLossSituation(
+                asset_config["name"],
+                money_code,
+                current_account_balance,
+                round(current_account_balance_in_rmb, 2),
+                round(this_month_profit_loss_situation_in_rmb, 2)
+            )
+            this_month_asset_profit_loss_situation_list.append(asset_profit_loss_situation)
+
+            # 按舍入后的金额累加, 与逐项展示的数值保持一致
+            this_month_total_profit_loss_situation_in_rmb += \
+                asset_profit_loss_situation.this_month_profit_loss_situation_in_rmb
+            this_month_account_balance_in_rmb += asset_profit_loss_situation.current_account_balance_in_rmb
+
+        # 逐行输出普通数值, 不打印 NamedTuple 和 Decimal 的 repr
+        asset_profit_loss_situation_lines = "\n".join(
+            f"{situation.name} {situation.money_code} 余额:{situation.current_account_balance} "
+            f"人民币金额:{situation.current_account_balance_in_rmb} "
+            f"本月盈亏:{situation.this_month_profit_loss_situation_in_rmb}"
+            for situation in this_month_asset_profit_loss_situation_list)
+        logger.info("本月{}资产盈亏情况:\n{}", assert_type.cn_name, asset_profit_loss_situation_lines)
+        return (this_month_asset_profit_loss_situation_list, this_month_total_profit_loss_situation_in_rmb,
+                this_month_account_balance_in_rmb)
 
     @staticmethod
     def __rebuild_next_month_asset_config(assert_type: AssetType, assert_config_list: List[dict[str, Any]]) -> List[
@@ -149,20 +167,16 @@ class AssetInventory:
             List[dict[str, Any]]: 下月资产配置列表
         """
 
-        if AssetType.CREDIT_CARD == assert_type:
+        if assert_type is AssetType.CREDIT_CARD:
             logger.info("信用卡不需要重建下月配置")
             return assert_config_list
 
-        next_month_asset_config_list = []
-
-        for assert_config in assert_config_list:
-            next_month_asset_config_list.append({
-                "name": assert_config["name"],
-                "money_code": assert_config["money_code"],
-                "current_account_balance": float(0.00),
-                "last_month_account_balance": assert_config["current_account_balance"]
-            })
-        return next_month_asset_config_list
+        # 浅拷贝原配置后只覆盖两个余额字段, 不修改调用方传入的配置
+        return [{
+            **assert_config,
+            "current_account_balance": 0.0,
+            "last_month_account_balance": assert_config["current_account_balance"]
+        } for assert_config in assert_config_list]
 
 
 if __name__ == '__main__':
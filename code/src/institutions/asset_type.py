@@ -26,16 +26,13 @@ class AssetType(Enum):
     PENSION_FUND = ("pension_fund", "养老金")
     CREDIT_CARD = ("credit_card", "信用卡")
 
-    @property
-    def en_name(self):
-        return self.value[0]
-
-    @property
-    def cn_name(self):
-        return self.value[1]
+    def __init__(self, en_name: str, cn_name: str):
+        # 直接作为成员属性保存, 避免每次访问时经过 property 并索引 value 元组
+        self.en_name = en_name
+        self.cn_name = cn_name
 
     @classmethod
-    def covert_from_en_str(cls, asset_en_str: str) -> "AssetType":
+    def convert_from_en_str(cls, asset_en_str: str) -> "AssetType":
         """将字符串财产类型转换为 AssetType 枚举
         Args:
             cls: AssetType 类
@@ -43,7 +40,11 @@ class AssetType(Enum):
         Returns:
             AssetType: 对应的 AssetType 枚举
         """
-        for member in cls:
-            if member.en_name == asset_en_str:
-                return member
-        raise ValueError(f"Invalid AssetType: {asset_en_str}")
+        try:
+            return _ASSET_TYPE_BY_EN_NAME[asset_en_str]
+        except KeyError as e:
+            raise ValueError(f"Invalid AssetType: {asset_en_str}") from e
+
+
+# 英文名 -> AssetType 索引, 导入时构建一次
+_ASSET_TYPE_BY_EN_NAME: dict[str, AssetType] = {member.en_name: member for member in AssetType}
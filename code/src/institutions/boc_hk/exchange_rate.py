@@ -13,25 +13,50 @@
 @Desc    :  基与 BOC HK 汇率计算工具
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
-from typing import List
 
-import bs4
-from bs4.element import Tag
 from loguru import logger
+from lxml import etree, html
 
-from institutions.money_code import MoneyCode
+from institutions.money_code import MoneyCode, RateKey, readable_rate_dict
+from utils.html_parse import parse_html
 from utils.http_client import HttpClient, HttpResponse
+from utils.rate_limiter import TokenBucket
+
+# 汇率取倒数时使用的常量, 避免每次重新解析 Decimal("1")
+_ONE = Decimal(1)
+
+# MoneyCode -> BOC HK 接口使用的货币代码 (BOC HK 以 RMB 表示人民币)
+_BOC_HK_CURRENCY_CODE = {
+    MoneyCode.CNY: "RMB",
+    MoneyCode.HKD: "HKD",
+    MoneyCode.USD: "USD",
+}
 
 
 class BocHkExchangeRate:
 
-    def __init__(self, exchange_rate_dict: dict[str, Decimal]):
+    def __init__(self, exchange_rate_dict: dict[RateKey, Decimal]):
         self._exchange_rate_dict = exchange_rate_dict
 
     def exchange_rate_transfer(self, from_code: MoneyCode, to_code: MoneyCode, amount: float) -> Decimal:
+        current_exchange_rate = self.get_exchange_rate(from_code, to_code)
+        return round(Decimal(str(amount)) * current_exchange_rate, 2)
+
+    def get_exchange_rate(self, from_code: MoneyCode, to_code: MoneyCode) -> Decimal:
+        """获取未经舍入的汇率
+
+        Args:
+            from_code: 源货币代码
+            to_code: 目标货币代码
+        Returns:
+            Decimal: 1 单位源货币可兑换的目标货币数量
+        """
         dict_key = self.dict_key(from_code, to_code)
-        current_exchange_rate = self._exchange_rate_dict[dict_key]
+        # 单次 get 查找, 缺失的汇率对走下方的 ValueError, 而不是抛出 KeyError
+        current_exchange_rate = self._exchange_rate_dict.get(dict_key)
 
         if current_exchange_rate is None:
             logger.error(f"Exchange rate not found for {from_code.value} to {to_code.value}")
@@ -41,48 +66,84 @@ class BocHkExchangeRate:
             logger.error(f"Exchange rate from {from_code.value} to {to_code.value} is less than 0")
             raise ValueError(f"Invalid exchange rate: {current_exchange_rate} for {from_code.value} to {to_code.value}")
 
-        return round(Decimal(str(amount)) * current_exchange_rate, 2)
+        return current_exchange_rate
 
     def add_new_rate(self, from_code: MoneyCode, to_code: MoneyCode, rate: str) -> None:
         dict_key = self.dict_key(from_code, to_code)
         self._exchange_rate_dict[dict_key] = Decimal(rate)
 
     @property
-    def exchange_rate(self) -> dict[str, Decimal]:
+    def exchange_rate(self) -> dict[RateKey, Decimal]:
         return self._exchange_rate_dict
 
     @staticmethod
-    def dict_key(from_code: MoneyCode, to_code: MoneyCode) -> str:
+    def dict_key(from_code: MoneyCode, to_code: MoneyCode) -> RateKey:
         """生成字典键"""
-        return f"{from_code.value}->{to_code.value}"
+        return from_code, to_code
 
     def __str__(self):
-        return f"BocHkExchangeRate ==> current exchange rate: {self._exchange_rate_dict})"
+        rate_dict = readable_rate_dict(self._exchange_rate_dict)
+        return f"BocHkExchangeRate ==> current exchange rate: {rate_dict})"
 
 
 class BocHkExchangeRateHandler:
 
-    def __init__(self):
-        self.http_client = HttpClient()
-
-    def fetch_exchange_rate(self) -> BocHkExchangeRate:
-
-        hkd_base_rate_dict = self.__request_hkd_base_rate()
-        usd_base_rate_dict = self.__request_usd_base_rate()
-        merged_rate_dict = {**hkd_base_rate_dict, **usd_base_rate_dict}
-
-        bock_exchange_rate = BocHkExchangeRate(merged_rate_dict)
+    # 在汇率表格中定位首个单元格内容为 $mark 的行 (货币标识固定在第一列), 预编译后整个查找在 lxml 的 C 层完成
+    _TARGET_RATE_TR_XPATH = etree.XPath(
+        "//*[@id='form-div']//*[contains(concat(' ', normalize-space(@class), ' '), ' import-data ')]"
+        "//tr[normalize-space(td[1])=$mark]")
+
+    def __init__(self, ttl_seconds: float = 300):
+        """
+        Args:
+            ttl_seconds: 汇率缓存的有效时间(秒), 有效期内重复获取不再请求 BOC HK
+        """
+        # BOC HK 频繁请求会返回 429, 客户端限制在 5 次/秒以内;
+        # 汇率查询 (包括实时汇率的 POST) 都是只读幂等请求, 遇到 429/503 时可以安全重试
+        self.http_client = HttpClient(rate_limiter=TokenBucket(rate=5, capacity=5), max_retries=3)
+        self._ttl_seconds = ttl_seconds
+        # (获取时间, 汇率字典)
+        self._cached_rate: tuple[float, dict[RateKey, Decimal]] | None = None
+
+    def fetch_exchange_rate(self, force_refresh: bool = False) -> BocHkExchangeRate:
+        """获取 BOC HK 汇率
+
+        Args:
+            force_refresh: 是否忽略缓存, 强制重新请求
+        Returns:
+            BocHkExchangeRate: 汇率对象
+        """
+        if not force_refresh and self._cached_rate is not None:
+            fetched_at, cached_rate_dict = self._cached_rate
+            if time.monotonic() - fetched_at < self._ttl_seconds:
+                # 返回副本, 避免调用方 add_new_rate 修改到缓存
+                return BocHkExchangeRate(dict(cached_rate_dict))
+
+        # 5 个请求互不依赖, 并发发出, 总耗时约等于最慢的一个请求
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            usd_base_rate_future = executor.submit(self.__request_usd_base_rate)
+            hkd_base_rate_dict = self.__request_hkd_base_rate(executor)
+            usd_base_rate_dict = usd_base_rate_future.result()
+        # 各请求返回的字典彼此独立, 直接在第一个字典上原地合并
+        merged_rate_dict = hkd_base_rate_dict
+        merged_rate_dict.update(usd_base_rate_dict)
+        self._cached_rate = (time.monotonic(), merged_rate_dict)
+
+        bock_exchange_rate = BocHkExchangeRate(dict(merged_rate_dict))
         return bock_exchange_rate
 
-    def __request_hkd_base_rate(self) -> dict[str, Decimal]:
-        # 请求 BOC HK 和 HKD 相关的汇率数据 - 实时
-        hkd_to_cny_real_time_rate = Decimal("1") / Decimal(
-            self.__request_hkd_base_real_time_rate(MoneyCode.HKD, MoneyCode.CNY))
-        cny_to_hkd_real_time_rate = Decimal(self.__request_hkd_base_real_time_rate(MoneyCode.CNY, MoneyCode.HKD))
+    def __request_hkd_base_rate(self, executor: ThreadPoolExecutor) -> dict[RateKey, Decimal]:
+        # 请求 BOC HK 和 HKD 相关的汇率数据 - 实时, 4 个请求并发发出
+        hkd_to_cny_future = executor.submit(self.__request_hkd_base_real_time_rate, MoneyCode.HKD, MoneyCode.CNY)
+        cny_to_hkd_future = executor.submit(self.__request_hkd_base_real_time_rate, MoneyCode.CNY, MoneyCode.HKD)
+        hkd_to_usd_future = executor.submit(self.__request_hkd_base_real_time_rate, MoneyCode.HKD, MoneyCode.USD)
+        usd_to_hkd_future = executor.submit(self.__request_hkd_base_real_time_rate, MoneyCode.USD, MoneyCode.HKD)
 
-        hkd_to_usd_real_time_rate = Decimal("1") / Decimal(
-            self.__request_hkd_base_real_time_rate(MoneyCode.HKD, MoneyCode.USD))
-        usd_to_hkd_real_time_rate = Decimal(self.__request_hkd_base_real_time_rate(MoneyCode.USD, MoneyCode.HKD))
+        hkd_to_cny_real_time_rate = _ONE / Decimal(hkd_to_cny_future.result())
+        cny_to_hkd_real_time_rate = Decimal(cny_to_hkd_future.result())
+
+        hkd_to_usd_real_time_rate = _ONE / Decimal(hkd_to_usd_future.result())
+        usd_to_hkd_real_time_rate = Decimal(usd_to_hkd_future.result())
 
         return {
             BocHkExchangeRate.dict_key(MoneyCode.HKD, MoneyCode.CNY): hkd_to_cny_real_time_rate,
@@ -91,18 +152,18 @@ class BocHkExchangeRateHandler:
             BocHkExchangeRate.dict_key(MoneyCode.USD, MoneyCode.HKD): usd_to_hkd_real_time_rate
         }
 
-    def __request_usd_base_rate(self) -> dict[str, Decimal]:
+    def __request_usd_base_rate(self) -> dict[RateKey, Decimal]:
 
         # 请求 BOC HK 和 USD 相关的汇率数据 - 有延迟
         http_response = self.http_client.get(
             "https://www.bochk.com/whk/rates/exchangeRatesUSD/exchangeRatesUSD-input.action?lang=en")
 
-        rate_tr_list = self.__parse_response(http_response)
-        usd_cny_rate = self.__search_rate(rate_tr_list, 'USD/CNH')
+        rate_document = self.__parse_response(http_response)
+        usd_cny_rate = self.__search_rate(rate_document, 'USD/CNH')
 
         # 因为表格中都是以美元为角度, 卖出美元，买入人民币(卖出 1 美元可以买入多少人民币), 和卖出人民币, 买入美元(卖出 多少人民币可以买入 1 美元)
         # 所以人民币兑美元, 需要将卖出人民币做转换
-        cny_to_usd_rate = Decimal("1") / Decimal(usd_cny_rate['buy'])
+        cny_to_usd_rate = _ONE / Decimal(usd_cny_rate['buy'])
 
         return {
             BocHkExchangeRate.dict_key(MoneyCode.CNY, MoneyCode.USD): cny_to_usd_rate,
@@ -112,8 +173,8 @@ class BocHkExchangeRateHandler:
     def __request_hkd_base_real_time_rate(self, from_code: MoneyCode, to_code: MoneyCode) -> str:
         form_data = {
             "bean.rateType": 1,
-            "bean.depCurrency": "RMB" if from_code == MoneyCode.CNY else from_code.value,
-            "bean.withdrCurrency": "RMB" if to_code == MoneyCode.CNY else to_code.value
+            "bean.depCurrency": _BOC_HK_CURRENCY_CODE[from_code],
+            "bean.withdrCurrency": _BOC_HK_CURRENCY_CODE[to_code]
         }
 
         http_response = self.http_client.post(
@@ -126,21 +187,20 @@ class BocHkExchangeRateHandler:
             raise Exception("Failed to fetch exchange rate data")
         return str(http_response.data).replace("\"", "")
 
-    def __request_hkd_base_delay_time_rate(self) -> dict[str, Decimal]:
-        http_client = HttpClient()
-        http_response = http_client.get(
+    def __request_hkd_base_delay_time_rate(self) -> dict[RateKey, Decimal]:
+        http_response = self.http_client.get(
             "https://www.bochk.com/whk/rates/exchangeRatesForCurrency/exchangeRatesForCurrency-input.action?lang=en")
 
-        rate_tr_list = self.__parse_response(http_response)
+        rate_document = self.__parse_response(http_response)
 
-        hkd_cny_rate = self.__search_rate(rate_tr_list, 'CNY')
-        hkd_usd_rate = self.__search_rate(rate_tr_list, 'USD')
+        hkd_cny_rate = self.__search_rate(rate_document, 'CNY')
+        hkd_usd_rate = self.__search_rate(rate_document, 'USD')
 
         # 因为表格中都是以其他货币为角度, 卖出多少其他货币，买入港币(卖出多少其他货币, 买入 1 港币), 和买入其他货币, 需要卖出多少港币(卖出多少港币可以买入 1 其他货币)
         # 所以港币转其他货币, 需要做一下转换
 
-        hkd_to_cny_rate = Decimal("1") / Decimal(hkd_cny_rate['buy'])
-        hkd_to_usd_rate = Decimal("1") / Decimal(hkd_usd_rate['buy'])
+        hkd_to_cny_rate = _ONE / Decimal(hkd_cny_rate['buy'])
+        hkd_to_usd_rate = _ONE / Decimal(hkd_usd_rate['buy'])
 
         return {
             BocHkExchangeRate.dict_key(MoneyCode.CNY, MoneyCode.HKD): Decimal(hkd_cny_rate['sell']),
@@ -150,30 +210,28 @@ class BocHkExchangeRateHandler:
         }
 
     @staticmethod
-    def __parse_response(http_response: HttpResponse) -> List[Tag]:
+    def __parse_response(http_response: HttpResponse) -> html.HtmlElement | None:
 
         if not http_response.is_success():
             print(
                 f"Failed to fetch exchange rate data, status code: {http_response.status_code}, response: {http_response.data}")
             raise Exception("Failed to fetch exchange rate data")
 
-        beautiful_soup = bs4.BeautifulSoup(http_response.data, features='lxml')
-        rate_tr_list = beautiful_soup.select("#form-div .import-data tr")
+        # 响应体为空时返回 None, 视为没有汇率行
+        return parse_html(http_response)
+
+    @staticmethod
+    def __search_rate(rate_document: html.HtmlElement | None, target_mark: str) -> dict[str, str]:
+
+        if rate_document is None:
+            return {}
 
+        rate_tr_list = BocHkExchangeRateHandler._TARGET_RATE_TR_XPATH(rate_document, mark=target_mark)
         if not rate_tr_list:
-            return []
-        return rate_tr_list
+            return {}
 
-    @staticmethod
-    def __search_rate(rate_tr_list: List[Tag], target_mark: str) -> dict[str, str]:
-
-        for rate_tr in rate_tr_list:
-            rate_tb_list = rate_tr.select("td")
-            for rate_tb in rate_tb_list:
-                tb_content = rate_tb.text.strip()
-                if tb_content == target_mark:
-                    return {
-                        "sell": rate_tb_list[1].text.strip(),
-                        "buy": rate_tb_list[2].text.strip()
-                    }
-        return {}
+        rate_td_list = rate_tr_list[0].findall("td")
+        return {
+            "sell": rate_td_list[1].text_content().strip(),
+            "buy": rate_td_list[2].text_content().strip()
+        }
@@ -12,12 +12,13 @@
 
 @Desc    :  招商银行私人理财数据查询
 """
-from datetime import datetime
+from datetime import date
 from typing import List
 
-import bs4
+from lxml import etree
 
-from utils.http_client import HttpClient, HttpResponse
+from utils.html_parse import parse_html
+from utils.http_client import HTTP_CLIENT, HttpResponse
 
 
 class PersonalFinanceParam:
@@ -80,6 +81,10 @@ class PersonalFinanceHandler:
                     f"&PageNo=1"
                     f"#toTarget")
 
+    # 净值表格的所有行, 预编译后只需一次 XPath 求值即可取出全部行
+    PRODUCT_TR_XPATH = etree.XPath(
+        "//*[@id='cList']//*[contains(concat(' ', normalize-space(@class), ' '), ' ProductTable ')]//tr")
+
     def __init__(self, personal_finance_param: PersonalFinanceParam, show_row_num: int = 3):
         self._personal_finance_param = personal_finance_param
         self._show_row_num = show_row_num
@@ -97,7 +102,7 @@ class PersonalFinanceHandler:
         向招商银行个人金融API发送请求
         """
         url = self.URL_TEMPLATE.format(code=self._personal_finance_param.product_code)
-        return HttpClient().get(url)
+        return HTTP_CLIENT.get(url)
 
     def __parse_response(self, http_response: HttpResponse) -> List[dict[str, float]]:
         """
@@ -108,8 +113,11 @@ class PersonalFinanceHandler:
                 f"Failed to fetch personal finance data, status code: {http_response.status_code}, "
                 f"error: {http_response.data}")
 
-        # 使用 BeautifulSoup 解析 HTML
-        soup = bs4.BeautifulSoup(http_response.data, 'lxml')
+        # 使用 lxml 解析 HTML, 一次取出所有行; 响应体为空时没有数据
+        document = parse_html(http_response)
+        if document is None:
+            return []
+        product_tr_list = self.PRODUCT_TR_XPATH(document)
 
         # 今天日期从第二行开始, 只计算需要的天数的
         start_index = 2
@@ -117,17 +125,16 @@ class PersonalFinanceHandler:
         end_index = start_index + self._show_row_num
 
         results = []
-        for i in range(start_index, end_index):
-            row_selector = f'#cList .ProductTable tr:nth-child({i}) td'
-            row_data = soup.select(row_selector)
+        for i, product_tr in enumerate(product_tr_list[start_index - 1:end_index - 1], start=start_index):
+            row_data = product_tr.findall("td")
 
             if len(row_data) < 5:  # 检查是否有足够的列
                 break
 
             try:
                 results.append({
-                    "date": self.convert_date_format(row_data[4].text),
-                    "net_asset_value": float(row_data[3].text.strip()),
+                    "date": self.convert_date_format(row_data[4].text_content()),
+                    "net_asset_value": float(row_data[3].text_content().strip()),
                 })
             except (ValueError, IndexError) as e:
                 raise RuntimeError(f"Error parsing row {i}: {e}") from e
@@ -148,8 +155,14 @@ class PersonalFinanceHandler:
         # 去除字符串中的多余空白字符
         no_whitespace_data_str = date_str.strip()
 
+        if (len(no_whitespace_data_str) != 8 or not no_whitespace_data_str.isascii()
+                or not no_whitespace_data_str.isdigit()):
+            raise RuntimeError(f"Invalid date format: {date_str}, expected yyyyMMdd")
+
+        year, month, day = no_whitespace_data_str[:4], no_whitespace_data_str[4:6], no_whitespace_data_str[6:]
+        # 用 date 校验日期真实存在 (如拒绝 2月30日), 输出仍直接由切片拼接, 不经过 strptime/strftime
         try:
-            date_obj = datetime.strptime(no_whitespace_data_str, '%Y%m%d')
-            return date_obj.strftime('%Y-%m-%d')
+            date(int(year), int(month), int(day))
         except ValueError as e:
             raise RuntimeError(f"Invalid date format: {date_str}, {e}") from e
+        return f"{year}-{month}-{day}"
@@ -13,21 +13,22 @@
 @Desc    :  基与 ExchangeRate-API 的汇率计算工具
 """
 import json
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from typing import List
 
-from institutions.money_code import MoneyCode
+from institutions.money_code import MoneyCode, RateKey, readable_rate_dict
 from utils.http_client import HttpClient
 
 
 class ExchangeRateApiExchangeRate:
 
-    def __init__(self, exchange_rate_dict: dict[str, Decimal]):
+    def __init__(self, exchange_rate_dict: dict[RateKey, Decimal]):
         self._exchange_rate_dict = exchange_rate_dict
 
     def exchange_rate_transfer(self, from_code: MoneyCode, to_code: MoneyCode, amount: float) -> Decimal:
         dict_key = self.dict_key(from_code, to_code)
-        current_exchange_rate = self._exchange_rate_dict[dict_key]
+        current_exchange_rate = self._exchange_rate_dict.get(dict_key)
 
         if current_exchange_rate is None:
             raise ValueError(f"Exchange rate not found for {from_code.value} to {to_code.value}")
@@ -42,16 +43,17 @@ class ExchangeRateApiExchangeRate:
         self._exchange_rate_dict[dict_key] = Decimal(rate)
 
     @property
-    def exchange_rate(self) -> dict[str, Decimal]:
+    def exchange_rate(self) -> dict[RateKey, Decimal]:
         return self._exchange_rate_dict
 
     @staticmethod
-    def dict_key(from_code: MoneyCode, to_code: MoneyCode) -> str:
+    def dict_key(from_code: MoneyCode, to_code: MoneyCode) -> RateKey:
         """生成字典键"""
-        return f"{from_code.value}->{to_code.value}"
+        return from_code, to_code
 
     def __str__(self):
-        return f"ExchangeRateApiExchangeRate ==> current exchange rate: {self._exchange_rate_dict})"
+        rate_dict = readable_rate_dict(self._exchange_rate_dict)
+        return f"ExchangeRateApiExchangeRate ==> current exchange rate: {rate_dict})"
 
 
 class ExchangeRateApiExchangeRateHandler:
@@ -61,17 +63,27 @@ class ExchangeRateApiExchangeRateHandler:
         self._http_client = HttpClient()
 
     def fetch_exchange_rate(self) -> ExchangeRateApiExchangeRate:
-        hkd_base_rate_dict = self.__request_money_code_base_rate(MoneyCode.HKD, [MoneyCode.USD, MoneyCode.CNY])
-        usd_base_rate_dict = self.__request_money_code_base_rate(MoneyCode.USD, [MoneyCode.HKD, MoneyCode.CNY])
-        cny_base_rate_dict = self.__request_money_code_base_rate(MoneyCode.CNY, [MoneyCode.HKD, MoneyCode.USD])
-
-        merged_rate_dict = {**hkd_base_rate_dict, **usd_base_rate_dict, **cny_base_rate_dict}
+        # 3 个请求互不依赖, 并发发出, 总耗时约等于最慢的一个请求
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            hkd_base_rate_future = executor.submit(self.__request_money_code_base_rate, MoneyCode.HKD,
+                                                   [MoneyCode.USD, MoneyCode.CNY])
+            usd_base_rate_future = executor.submit(self.__request_money_code_base_rate, MoneyCode.USD,
+                                                   [MoneyCode.HKD, MoneyCode.CNY])
+            cny_base_rate_future = executor.submit(self.__request_money_code_base_rate, MoneyCode.CNY,
+                                                   [MoneyCode.HKD, MoneyCode.USD])
+            hkd_base_rate_dict = hkd_base_rate_future.result()
+            usd_base_rate_dict = usd_base_rate_future.result()
+            cny_base_rate_dict = cny_base_rate_future.result()
+
+        merged_rate_dict = hkd_base_rate_dict
+        merged_rate_dict.update(usd_base_rate_dict)
+        merged_rate_dict.update(cny_base_rate_dict)
         exchange_rate_api_exchange_rate = ExchangeRateApiExchangeRate(merged_rate_dict)
         return exchange_rate_api_exchange_rate
 
     def __request_money_code_base_rate(self,
                                        base_money_code: MoneyCode,
-                                       query_money_code: List[MoneyCode]) -> dict[str, Decimal]:
+                                       query_money_code: List[MoneyCode]) -> dict[RateKey, Decimal]:
         request_url = self.REQUEST_URL.format(code=base_money_code.value)
         http_response = self._http_client.get(request_url)
         if not http_response.is_success():
@@ -79,7 +91,7 @@ class ExchangeRateApiExchangeRateHandler:
                 f"Failed to fetch exchange rate data, status code: {http_response.status_code}, response: {http_response.data}")
             raise Exception("Failed to fetch exchange rate data")
 
-        rate_list_json = json.loads(http_response.data)["rates"]
+        rate_list_json = json.loads(http_response.content)["rates"]
         rate_dict = {}
         for money_code in query_money_code:
             rate_value = rate_list_json[money_code.value]
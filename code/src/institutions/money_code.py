@@ -12,7 +12,9 @@
 
 @Desc    :  常用货币代码枚举类
 """
+from decimal import Decimal
 from enum import Enum
+from typing import Tuple
 
 
 class MoneyCode(Enum):
@@ -22,7 +24,7 @@ class MoneyCode(Enum):
     CNY = "CNY"  # 人民币
 
     @staticmethod
-    def covert_from_str(money_code_str: str) -> "MoneyCode":
+    def convert_from_str(money_code_str: str) -> "MoneyCode":
         """将字符串货币代码转换为 MoneyCode 枚举
 
         Args:
@@ -30,7 +32,25 @@ class MoneyCode(Enum):
         Returns:
             MoneyCode: 对应的 MoneyCode 枚举
         """
-        try:
-            return MoneyCode(money_code_str)
-        except ValueError as e:
-            raise ValueError(f"Invalid MoneyCode: {money_code_str}") from e
+        money_code = _MONEY_CODE_BY_STR.get(money_code_str)
+        if money_code is None:
+            raise ValueError(f"Invalid MoneyCode: {money_code_str}")
+        return money_code
+
+
+# 字符串 -> MoneyCode 索引, 导入时构建一次
+_MONEY_CODE_BY_STR: dict[str, MoneyCode] = {member.value: member for member in MoneyCode}
+
+# 汇率字典键: (源货币, 目标货币), 枚举按身份哈希, 无需每次拼接字符串
+RateKey = Tuple[MoneyCode, MoneyCode]
+
+
+def readable_rate_dict(rate_dict: dict[RateKey, Decimal]) -> dict[str, Decimal]:
+    """将汇率字典的键转换为 "源货币->目标货币" 形式, 用于日志和打印
+
+    Args:
+        rate_dict: (源货币, 目标货币) -> 汇率
+    Returns:
+        dict[str, Decimal]: "源货币->目标货币" -> 汇率
+    """
+    return {f"{from_code.value}->{to_code.value}": rate for (from_code, to_code), rate in rate_dict.items()}
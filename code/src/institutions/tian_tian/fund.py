@@ -14,9 +14,10 @@
 """
 from typing import List
 
-from bs4 import BeautifulSoup
+from lxml import etree, html
 
-from utils.http_client import HttpClient, HttpResponse
+from utils.html_parse import parse_html
+from utils.http_client import HTTP_CLIENT, HttpResponse
 
 
 class TianTianFundParam:
@@ -70,6 +71,17 @@ class TianTianFundHandler:
     天天基金处理类
     """
 
+    REQUEST_URL = "http://fund.eastmoney.com/f10/F10DataApi.aspx"
+
+    # 天天基金会拒绝没有浏览器 User-Agent 的请求, 只对该站点携带
+    REQUEST_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) '
+                      'Chrome/92.0.4515.131 Safari/537.36'
+    }
+
+    # 净值表格的所有行, 第一行为表头
+    FUND_TR_XPATH = etree.XPath("//tr")
+
     def __init__(self, tian_tian_fund_param: TianTianFundParam):
         self._tian_tian_fund_param = tian_tian_fund_param
 
@@ -83,21 +95,17 @@ class TianTianFundHandler:
         :return: 包含基金数据的字典
         """
 
-        url = (f"http://fund.eastmoney.com/f10/F10DataApi.aspx?"
-               f"type={self._tian_tian_fund_param.data_type}"
-               f"&code={self._tian_tian_fund_param.fund_code}"
-               f"&sdate={self._tian_tian_fund_param.start_date}"
-               f"&edate={self._tian_tian_fund_param.end_date}"
-               f"&page={self._tian_tian_fund_param.page}"
-               f"&per={self._tian_tian_fund_param.per}")
-
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) '
-                          'Chrome/92.0.4515.131 Safari/537.36'
+        params = {
+            "type": self._tian_tian_fund_param.data_type,
+            "code": self._tian_tian_fund_param.fund_code,
+            "sdate": self._tian_tian_fund_param.start_date,
+            "edate": self._tian_tian_fund_param.end_date,
+            "page": self._tian_tian_fund_param.page,
+            "per": self._tian_tian_fund_param.per
         }
 
-        http_client = HttpClient()
-        return http_client.get(url, headers=headers)
+        # 查询参数由 requests 统一编码
+        return HTTP_CLIENT.get(self.REQUEST_URL, params=params, headers=self.REQUEST_HEADERS)
 
     @staticmethod
     def __parse_response(http_response: HttpResponse) -> List[dict[str, float]]:
@@ -106,23 +114,26 @@ class TianTianFundHandler:
                 f"Failed to fetch tian tian fund data, status code: {http_response.status_code}, response: {http_response.data}")
             raise Exception("Failed to fetch tian tian fund data")
 
-        soup = BeautifulSoup(http_response.data, 'html.parser')
-        table_rows = soup.find_all("tr")
+        document = parse_html(http_response)
+        if document is None:
+            return []
+
+        table_rows = TianTianFundHandler.FUND_TR_XPATH(document)
         responses = []
 
         for row in table_rows[1:]:
             try:
-                columns = row.find_all("td")
+                columns = row.findall("td")
                 if len(columns) < 2:
                     # Skip rows with insufficient data
                     continue
 
-                date = columns[0].text.strip()
-                net_asset_value = float(columns[1].text.strip())
+                date = columns[0].text_content().strip()
+                net_asset_value = float(columns[1].text_content().strip())
                 responses.append({
                     "date": date,
                     "net_asset_value": net_asset_value
                 })
             except (IndexError, ValueError) as e:
-                print(f"Error parsing row: {row}, {e}")
+                print(f"Error parsing row: {html.tostring(row, encoding='unicode')}, {e}")
         return responses
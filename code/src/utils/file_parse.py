@@ -12,11 +12,23 @@
 
 @Desc    :  文件解析工具
 """
+import copy
+import os
+import shutil
+import threading
+from functools import lru_cache
 from pathlib import Path
 
 import yaml
 from loguru import logger
 
+# 优先使用基于 libyaml 的 C 实现, 不可用时退回纯 Python 实现
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+
 def parse_yaml_file(file_path: str) -> dict | list| None:
     """ 解析 YAML 文件
     Args:
@@ -25,11 +37,11 @@ def parse_yaml_file(file_path: str) -> dict | list| None:
         dict or list: 解析后的数据，如果解析失败则返回 None
     """
     try:
-        # 打开并读取 YAML 文件
-        with open(file_path, 'r', encoding='utf-8') as file:
-            # 解析 YAML 内容为 Python 字典/列表
-            data = yaml.safe_load(file)
-            return data
+        # 以修改时间和大小作为缓存键, 文件未变化时复用上次的解析结果
+        file_stat = os.stat(file_path)
+        data = _load_yaml_file(file_path, file_stat.st_mtime_ns, file_stat.st_size)
+        # 返回副本, 避免调用方修改到缓存中的数据
+        return copy.deepcopy(data)
     except FileNotFoundError:
         logger.warning(f"错误：文件 '{file_path}' 未找到")
     except yaml.YAMLError as e:
@@ -38,21 +50,62 @@ def parse_yaml_file(file_path: str) -> dict | list| None:
         logger.warning(f"发生错误：{e}")
     return None
 
+
+@lru_cache(maxsize=32)
+def _load_yaml_file(file_path: str, mtime_ns: int, size: int) -> dict | list | None:
+    """ 读取并解析 YAML 文件, 结果按 (路径, 修改时间, 大小) 缓存
+    Args:
+        file_path (str): YAML 文件的路径
+        mtime_ns (int): 文件修改时间, 仅作为缓存键
+        size (int): 文件大小, 仅作为缓存键
+    Returns:
+        dict or list: 解析后的数据
+    """
+    # 以二进制方式读取, 由 libyaml 在 C 层完成 UTF-8 解码
+    with open(file_path, 'rb') as file:
+        # 解析 YAML 内容为 Python 字典/列表
+        return yaml.load(file, Loader=SafeLoader)
+
+
 def write_yaml_file(file_path: str, data: dict | list) -> None:
     """ 将数据写入 YAML 文件
+
+    先完整序列化, 再写入同目录下的临时文件并原子替换目标文件, 序列化或写入失败时原文件保持不变
+
     Args:
         file_path (str): YAML 文件的路径
         data (dict or list): 要写入的数据
+    Raises:
+        yaml.YAMLError: 数据无法序列化为 YAML
+        OSError: 文件写入失败
     """
 
     # 转换为 Path 对象（如果输入是字符串）
     path = Path(file_path) if isinstance(file_path, str) else file_path
 
+    try:
+        # 保持配置中原有的键顺序, 不做排序; 由 Dumper 直接输出 UTF-8 字节
+        content = yaml.dump(data, Dumper=SafeDumper, allow_unicode=True, default_flow_style=False, sort_keys=False,
+                            encoding='utf-8')
+    except Exception as e:
+        logger.error(f"序列化 YAML 数据失败：{e}")
+        raise
+
     # 创建目录（如果不存在）
     path.parent.mkdir(parents=True, exist_ok=True)
 
+    # 临时文件按默认 umask 创建, 目标文件已存在时沿用其权限
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
     try:
-        with open(file_path, 'w', encoding='utf-8') as file:
-            yaml.dump(data, file, allow_unicode=True)
+        with open(temp_path, 'wb') as file:
+            file.write(content)
+        if path.exists():
+            shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
     except Exception as e:
-        logger.warning(f"写入 YAML 文件失败：{e}")
+        logger.error(f"写入 YAML 文件失败：{e}")
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+"""
+@Author  :  lcx29
+
+@Software:  PyCharm
+
+@File    :  html_parse.py
+
+@Time    :  2025-08-16 15:20:31
+
+@Desc    :  HTML 响应解析工具
+"""
+from typing import Optional
+
+from lxml import html
+
+from utils.http_client import HttpResponse
+
+# 响应统一按 UTF-8 解码, 直接从字节解析, 不先生成 str
+HTML_PARSER = html.HTMLParser(encoding="utf-8")
+
+
+def parse_html(http_response: HttpResponse) -> Optional[html.HtmlElement]:
+    """ 将 HTTP 响应体解析为 HTML 文档
+    Args:
+        http_response (HttpResponse): 成功的 HTTP 响应
+    Returns:
+        HtmlElement: 解析后的文档, 响应体为空时返回 None (lxml 解析空内容会抛出 ParserError)
+    """
+    content = http_response.content
+    if not content or not content.strip():
+        return None
+    return html.fromstring(content, parser=HTML_PARSER)
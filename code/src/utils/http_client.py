@@ -12,11 +12,15 @@
 
 @Desc    :  基与 requests 封装的 HTTP 客户端
 """
+import time
 from enum import Enum
-from typing import Any, Dict
+from typing import Any, Dict, Union
 
 import requests
 from requests import Timeout, HTTPError
+from requests.adapters import HTTPAdapter
+
+from utils.rate_limiter import TokenBucket
 
 
 class HttpResponseCode(Enum):
@@ -27,39 +31,100 @@ class HttpResponseCode(Enum):
 
 class HttpResponse:
 
-    def __init__(self, status_code: int, data: Any):
+    def __init__(self, status_code: int, data: Any = None, content: bytes | None = None):
+        """
+        Args:
+            status_code: 状态码
+            data: 响应数据, 失败时为错误信息
+            content: 原始响应字节, 成功时由 HttpClient 填充, data 在首次访问时才由其解码得到
+        """
         self._status_code = status_code
         self._data = data
+        self._content = content
 
     def is_success(self) -> bool:
         return self._status_code == HttpResponseCode.SUCCESS.value
 
     @property
     def data(self) -> Any:
+        # 延迟解码: 直接消费字节的解析器 (lxml, json) 无需付出 UTF-8 解码的代价
+        if self._data is None and self._content is not None:
+            try:
+                self._data = self._content.decode("utf-8")
+            except UnicodeDecodeError:
+                # 解码发生在 HttpClient 的异常处理之外, 非 UTF-8 响应不能让调用方 (包括 __str__) 抛出异常
+                self._data = self._content.decode("utf-8", errors="replace")
         return self._data
 
+    @property
+    def content(self) -> bytes | None:
+        return self._content
+
     @property
     def status_code(self) -> int:
         return self._status_code
 
     def __str__(self):
-        return f"HttpResponse(status_code={self._status_code}, data={self._data})"
+        return f"HttpResponse(status_code={self._status_code}, data={self.data})"
+
+
+# 默认超时时间(秒): (连接超时, 读取超时)
+DEFAULT_TIMEOUT = (5, 15)
+
+# 需要重试的状态码: 限流和服务暂不可用
+RETRY_STATUS_CODES = frozenset({429, 503})
+
+
+def _create_session() -> requests.Session:
+    """创建带连接池的 Session, 不在连接池层做任何重试"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
 class HttpClient:
 
+    # 所有客户端实例共用一个 Session 连接池, 复用 keep-alive 连接, 避免每次请求重新握手 TCP/TLS
+    _session = _create_session()
+
+    def __init__(self,
+                 rate_limiter: TokenBucket | None = None,
+                 verify: Union[bool, str] = True,
+                 max_retries: int = 0,
+                 backoff_factor: float = 0.5,
+                 max_backoff: float = 4.0,
+                 timeout: float | tuple[float, float] = DEFAULT_TIMEOUT):
+        """
+        Args:
+            rate_limiter: 可选的令牌桶限流器, 每次发送请求 (包括重试) 前先获取令牌
+            verify: TLS 证书校验, True 使用 requests 自带的 certifi 证书包, 也可传入 CA 证书包路径或 False
+            max_retries: 遇到 429/503 时的最大重试次数, 默认不重试; 不区分请求方法, 只应对幂等请求开启
+            backoff_factor: 指数退避系数, 第 n 次重试前等待 backoff_factor * 2^n 秒
+            max_backoff: 单次重试前的最长等待时间(秒), 同时限制 Retry-After 指定的等待时间
+            timeout: 请求超时时间(秒), 可为 (连接超时, 读取超时)
+        """
+        self._rate_limiter = rate_limiter
+        self._verify = verify
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._max_backoff = max_backoff
+        self._timeout = timeout
+
     def get(self, url: str, params: Dict[str, Any] = None, **kwargs) -> HttpResponse:
         return self._request("get", url, params=params, **kwargs)
 
     def post(self, url: str, data: Dict[str, Any] = None, body: Dict[str, Any] = None, **kwargs) -> HttpResponse:
         return self._request("post", url, data=data, json=body, **kwargs)
 
-    @staticmethod
-    def _request(method: str, url: str, **kwargs) -> HttpResponse:
+    def _request(self, method: str, url: str, **kwargs) -> HttpResponse:
+        kwargs.setdefault("verify", self._verify)
+        kwargs.setdefault("timeout", self._timeout)
         try:
-            response = requests.request(method=method, url=url, **kwargs)
+            response = self._send_with_retry(method, url, **kwargs)
             response.raise_for_status()
-            return HttpResponse(HttpResponseCode.SUCCESS.value, response.content.decode("utf-8"))
+            return HttpResponse(HttpResponseCode.SUCCESS.value, content=response.content)
         except ConnectionError as e:
             return HttpResponse(HttpResponseCode.FAILED.value, {"error: ": "Connection error: " + str(e)})
         except Timeout as e:
@@ -68,3 +133,32 @@ class HttpClient:
             return HttpResponse(HttpResponseCode.FAILED.value, {"error: ": "HTTP error: " + str(e)})
         except Exception as e:
             return HttpResponse(HttpResponseCode.UNKNOWN_ERROR.value, {"error: ": "Unknown error: " + str(e)})
+
+    def _send_with_retry(self, method: str, url: str, **kwargs) -> requests.Response:
+        """发送请求, 遇到 429/503 时按 Retry-After 或指数退避重试, 每次发送前都经过限流器"""
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+            response = self._session.request(method=method, url=url, **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= self._max_retries:
+                return response
+
+            delay = self._retry_delay(response, attempt)
+            # 释放连接回连接池后再等待
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """计算重试前的等待时间, 优先使用秒数形式的 Retry-After, 且不超过 max_backoff"""
+        retry_after = response.headers.get("Retry-After", "").strip()
+        if retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            delay = self._backoff_factor * (2 ** attempt)
+        return min(delay, self._max_backoff)
+
+
+# 无需单独限流的调用方共用的客户端实例
+HTTP_CLIENT = HttpClient()
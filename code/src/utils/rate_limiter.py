@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+"""
+@Author  :  lcx29
+
+@Software:  PyCharm
+
+@File    :  rate_limiter.py
+
+@Time    :  2025-08-16 10:12:41
+
+@Desc    :  线程安全的令牌桶限流器
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    """令牌桶限流器
+
+    以 rate 个/秒的速度补充令牌, 最多累积 capacity 个, 每次请求消耗 1 个令牌, 令牌不足时阻塞等待
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Args:
+            rate: 每秒补充的令牌数
+            capacity: 令牌桶容量, 即允许的最大突发请求数
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError(f"Invalid token bucket config: rate={rate}, capacity={capacity}")
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """获取 1 个令牌, 令牌不足时阻塞到有可用令牌为止"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._last_refill_time) * self._rate)
+                self._last_refill_time = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self._rate
+            # 在锁外等待, 不阻塞其他线程补充和获取令牌
+            time.sleep(wait_seconds)
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
@@ -13,16 +13,52 @@
 @Desc    :  institutions.boc_hk.exchange_rate 测试类
 """
 
+import threading
 import unittest
+from unittest import mock
 
+from exchange_rate_test_mixin import ExchangeRateTransferTestMixin
 from institutions.boc_hk.exchange_rate import BocHkExchangeRateHandler
 from institutions.money_code import MoneyCode
+from utils.http_client import HttpResponse
 
+# 离线测试使用的 USD 汇率页面, 只包含 USD/CNH 一行
+_USD_RATE_PAGE = (b"<html><body><div id='form-div'><table class='import-data'>"
+                  b"<tr><td>USD/CNH</td><td>7.1500</td><td>7.1200</td></tr>"
+                  b"</table></div></body></html>")
 
-class TestBocHkExchangeRateHandler(unittest.TestCase):
+# 实时汇率接口的返回值: (存入货币, 取出货币) -> 汇率
+_REAL_TIME_RATES = {("HKD", "RMB"): "1.0950", ("RMB", "HKD"): "1.0870",
+                    ("HKD", "USD"): "7.8500", ("USD", "HKD"): "7.7900"}
 
-    def setUp(self):
-        self.exchange_rate_handler = BocHkExchangeRateHandler()
+
+class _CountingHttpClient:
+    """替代 BOC HK 的 HttpClient, 记录请求次数, 不访问网络"""
+
+    def __init__(self):
+        self.call_count = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, **kwargs):
+        self.__count()
+        return HttpResponse(200, content=_USD_RATE_PAGE)
+
+    def post(self, url, data=None, body=None, **kwargs):
+        self.__count()
+        rate = _REAL_TIME_RATES[(data["bean.depCurrency"], data["bean.withdrCurrency"])]
+        return HttpResponse(200, content=f'"{rate}"'.encode())
+
+    def __count(self):
+        # 汇率请求在线程池中并发发出
+        with self._lock:
+            self.call_count += 1
+
+
+class TestBocHkExchangeRateHandler(ExchangeRateTransferTestMixin, unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.exchange_rate_handler = BocHkExchangeRateHandler()
 
     def test_exchange_rate_transfer(self):
         exchange_rate = self.exchange_rate_handler.fetch_exchange_rate()
@@ -30,12 +66,51 @@ class TestBocHkExchangeRateHandler(unittest.TestCase):
         print(exchange_rate)
 
         cal_num = 35*5
+        self.assert_exchange_rate_transfer(exchange_rate, cal_num)
+
+
+class TestBocHkExchangeRateCache(unittest.TestCase):
+
+    # 一次完整获取: 1 个 USD 汇率页面 GET + 4 个实时汇率 POST
+    REQUESTS_PER_FETCH = 5
+
+    def setUp(self):
+        self.handler = BocHkExchangeRateHandler(ttl_seconds=300)
+        self.http_client = _CountingHttpClient()
+        self.handler.http_client = self.http_client
+
+        # 只替换被测模块中的时钟, 不影响线程池等其他代码
+        time_patcher = mock.patch("institutions.boc_hk.exchange_rate.time")
+        self.mock_time = time_patcher.start()
+        self.addCleanup(time_patcher.stop)
+        self.mock_time.monotonic.return_value = 1000.0
+
+    def test_cached_within_ttl(self):
+        first_rate = self.handler.fetch_exchange_rate()
+        self.assertEqual(self.http_client.call_count, self.REQUESTS_PER_FETCH)
+
+        self.mock_time.monotonic.return_value = 1000.0 + 299
+        second_rate = self.handler.fetch_exchange_rate()
+        self.assertEqual(self.http_client.call_count, self.REQUESTS_PER_FETCH)
+        self.assertEqual(second_rate.exchange_rate, first_rate.exchange_rate)
+
+        # 调用方修改返回的汇率不影响缓存
+        second_rate.add_new_rate(MoneyCode.USD, MoneyCode.CNY, "1")
+        self.assertEqual(self.handler.fetch_exchange_rate().exchange_rate, first_rate.exchange_rate)
+
+    def test_force_refresh_bypasses_cache(self):
+        self.handler.fetch_exchange_rate()
+        self.handler.fetch_exchange_rate(force_refresh=True)
+        self.assertEqual(self.http_client.call_count, 2 * self.REQUESTS_PER_FETCH)
 
-        print(f"CNY->USD: {exchange_rate.exchange_rate_transfer(MoneyCode.CNY, MoneyCode.USD, cal_num)}")
-        print(f"CNY->HKD: {exchange_rate.exchange_rate_transfer(MoneyCode.CNY, MoneyCode.HKD, cal_num)}")
+    def test_cache_expires_after_ttl(self):
+        self.handler.fetch_exchange_rate()
 
-        print(f"HKD->CNY: {exchange_rate.exchange_rate_transfer(MoneyCode.HKD, MoneyCode.CNY, cal_num)}")
-        print(f"HKD->USD: {exchange_rate.exchange_rate_transfer(MoneyCode.HKD, MoneyCode.USD, cal_num)}")
+        self.mock_time.monotonic.return_value = 1000.0 + 300
+        self.handler.fetch_exchange_rate()
+        self.assertEqual(self.http_client.call_count, 2 * self.REQUESTS_PER_FETCH)
 
-        print(f"USD->CNY: {exchange_rate.exchange_rate_transfer(MoneyCode.USD, MoneyCode.CNY, cal_num)}")
-        print(f"USD->HKD: {exchange_rate.exchange_rate_transfer(MoneyCode.USD, MoneyCode.HKD, cal_num)}")
+        # 重新获取后以新的时间开始计算有效期
+        self.mock_time.monotonic.return_value = 1000.0 + 301
+        self.handler.fetch_exchange_rate()
+        self.assertEqual(self.http_client.call_count, 2 * self.REQUESTS_PER_FETCH)
@@ -12,11 +12,12 @@
 
 @Desc    :  TODO
 """
+import json
+
 from utils.http_client import HttpClient
-import certifi
 
 if __name__ == '__main__':
-    HttpClient = HttpClient()
+    http_client = HttpClient()
 
     header = {
         "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
@@ -28,10 +29,13 @@ if __name__ == '__main__':
     }
 
     data = {
-        "REQ_MESSAGE": "{\"REQ_HEAD\":{\"TRAN_PROCESS\":\"\",\"TRAN_ID\":\"\"},\"REQ_BODY\":{\"c_fundcode\":\"5811224061\",\"c_interestway\":\"0\",\"c_productcode\":\"undefined\",\"type\":\"month\"}}"
+        "REQ_MESSAGE": json.dumps({
+            "REQ_HEAD": {"TRAN_PROCESS": "", "TRAN_ID": ""},
+            "REQ_BODY": {"c_fundcode": "5811224061", "c_interestway": "0", "c_productcode": "undefined", "type": "month"}
+        }, separators=(",", ":"))
     }
 
-    print(HttpClient.post(url="https://www.bocommwm.com/SITE/queryJylcBreakDetail.do", data=data, body=None,
-                          headers=header, verify=certifi.where()))
+    print(http_client.post(url="https://www.bocommwm.com/SITE/queryJylcBreakDetail.do", data=data, body=None,
+                           headers=header))
 
-    # print(HttpClient.post("https://www.bocommwm.com/SITE/queryJylcBreakDetail.do", data, headers=header))
+    # print(http_client.post("https://www.bocommwm.com/SITE/queryJylcBreakDetail.do", data, headers=header))
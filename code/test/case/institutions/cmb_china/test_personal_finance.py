@@ -32,3 +32,22 @@ class TestPersonalFinanceHandler(unittest.TestCase):
         personal_finance_data = test_personal_finance_handler.fetch_personal_finance_data()
         self.assertIsNotNone(personal_finance_data)
         print(personal_finance_data)
+
+    def test_convert_date_format(self):
+        self.assertEqual(PersonalFinanceHandler.convert_date_format(" 20250815 "), "2025-08-15")
+        self.assertEqual(PersonalFinanceHandler.convert_date_format("20240229"), "2024-02-29")
+
+        # 不存在的日期
+        for date_str in ["20250230", "20250431", "20230229", "20251301", "20250800"]:
+            with self.subTest(date_str=date_str):
+                with self.assertRaises(RuntimeError):
+                    PersonalFinanceHandler.convert_date_format(date_str)
+
+        # 格式错误
+        for date_str in ["2025-0815", "2025081", "202508150", "abcdefgh", "２０２５０８１５"]:
+            with self.subTest(date_str=date_str):
+                with self.assertRaises(RuntimeError):
+                    PersonalFinanceHandler.convert_date_format(date_str)
+
+        with self.assertRaises(ValueError):
+            PersonalFinanceHandler.convert_date_format("")
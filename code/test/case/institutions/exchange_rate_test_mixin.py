@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+"""
+@Author  :  lcx29
+
+@Software:  PyCharm
+
+@File    :  exchange_rate_test_mixin.py
+
+@Time    :  2025-08-16 16:40:18
+
+@Desc    :  汇率兑换测试的公共断言
+"""
+from itertools import permutations
+
+from institutions.money_code import MoneyCode
+
+
+class ExchangeRateTransferTestMixin:
+    """与 unittest.TestCase 一起继承, 对所有货币组合做兑换和往返兑换断言"""
+
+    # 所有不同货币之间的兑换组合
+    CURRENCY_PAIRS = list(permutations([MoneyCode.CNY, MoneyCode.HKD, MoneyCode.USD], 2))
+
+    # 往返兑换允许的相对误差
+    ROUND_TRIP_TOLERANCE = 0.05
+
+    def assert_exchange_rate_transfer(self, exchange_rate, cal_num: float) -> None:
+        """
+        Args:
+            exchange_rate: 提供 exchange_rate_transfer(from_code, to_code, amount) 的汇率对象
+            cal_num: 参与兑换的金额
+        """
+        for from_code, to_code in self.CURRENCY_PAIRS:
+            with self.subTest(from_code=from_code.value, to_code=to_code.value):
+                transferred = exchange_rate.exchange_rate_transfer(from_code, to_code, cal_num)
+                print(f"{from_code.value}->{to_code.value}: {transferred}")
+                self.assertGreater(transferred, 0)
+
+                # 兑换后再换回, 结果应接近原金额, 误差来自买卖价差和两次保留 2 位小数
+                round_trip = exchange_rate.exchange_rate_transfer(to_code, from_code, float(transferred))
+                self.assertAlmostEqual(float(round_trip), cal_num, delta=cal_num * self.ROUND_TRIP_TOLERANCE)
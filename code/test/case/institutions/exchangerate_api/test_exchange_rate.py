@@ -14,14 +14,15 @@
 """
 import unittest
 
+from exchange_rate_test_mixin import ExchangeRateTransferTestMixin
 from institutions.exchangerate_api.exchange_rate import ExchangeRateApiExchangeRateHandler
-from institutions.money_code import MoneyCode
 
 
-class TestExchangeRateApiExchangeRateHandler(unittest.TestCase):
+class TestExchangeRateApiExchangeRateHandler(ExchangeRateTransferTestMixin, unittest.TestCase):
 
-    def setUp(self):
-        self.exchange_rate_handler = ExchangeRateApiExchangeRateHandler()
+    @classmethod
+    def setUpClass(cls):
+        cls.exchange_rate_handler = ExchangeRateApiExchangeRateHandler()
 
     def test_exchange_rate_transfer(self):
         exchange_rate = self.exchange_rate_handler.fetch_exchange_rate()
@@ -29,12 +30,4 @@ class TestExchangeRateApiExchangeRateHandler(unittest.TestCase):
         print(exchange_rate)
 
         cal_num = 12.21
-
-        print(f"CNY->USD: {exchange_rate.exchange_rate_transfer(MoneyCode.CNY, MoneyCode.USD, cal_num)}")
-        print(f"CNY->HKD: {exchange_rate.exchange_rate_transfer(MoneyCode.CNY, MoneyCode.HKD, cal_num)}")
-
-        print(f"HKD->CNY: {exchange_rate.exchange_rate_transfer(MoneyCode.HKD, MoneyCode.CNY, cal_num)}")
-        print(f"HKD->USD: {exchange_rate.exchange_rate_transfer(MoneyCode.HKD, MoneyCode.USD, cal_num)}")
-
-        print(f"USD->CNY: {exchange_rate.exchange_rate_transfer(MoneyCode.USD, MoneyCode.CNY, cal_num)}")
-        print(f"USD->HKD: {exchange_rate.exchange_rate_transfer(MoneyCode.USD, MoneyCode.HKD, cal_num)}")
+        self.assert_exchange_rate_transfer(exchange_rate, cal_num)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+"""
+@Author  :  lcx29
+
+@Software:  PyCharm
+
+@File    :  test_file_parse.py
+
+@Time    :  2025-08-16 16:05:42
+
+@Desc    :  utils.file_parse 测试类
+"""
+
+import os
+import tempfile
+import unittest
+
+import yaml
+
+from utils.file_parse import parse_yaml_file, write_yaml_file
+
+
+class TestFileParse(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.file_path = os.path.join(self.temp_dir, "asset_inventory.yaml")
+
+    def test_write_and_parse_round_trip(self):
+        data = {"fund": [{"name": "基金", "money_code": "CNY", "current_account_balance": 100.5}], "bank": []}
+        write_yaml_file(self.file_path, data)
+        self.assertEqual(parse_yaml_file(self.file_path), data)
+        self.assertEqual(os.listdir(self.temp_dir), ["asset_inventory.yaml"])
+
+    def test_dump_failure_keeps_original_file(self):
+        write_yaml_file(self.file_path, {"fund": []})
+        with open(self.file_path, "rb") as file:
+            original_content = file.read()
+
+        # SafeDumper 无法序列化任意对象
+        with self.assertRaises(yaml.YAMLError):
+            write_yaml_file(self.file_path, {"fund": [object()]})
+
+        with open(self.file_path, "rb") as file:
+            self.assertEqual(file.read(), original_content)
+        self.assertEqual(os.listdir(self.temp_dir), ["asset_inventory.yaml"])
+
+    def test_parse_after_rewrite_returns_new_content(self):
+        write_yaml_file(self.file_path, {"fund": []})
+        self.assertEqual(parse_yaml_file(self.file_path), {"fund": []})
+
+        write_yaml_file(self.file_path, {"fund": [{"name": "a"}], "bank": [{"name": "b"}]})
+        self.assertEqual(parse_yaml_file(self.file_path), {"fund": [{"name": "a"}], "bank": [{"name": "b"}]})
+
+    def test_modifying_result_does_not_change_cache(self):
+        write_yaml_file(self.file_path, {"fund": [{"name": "a"}]})
+
+        data = parse_yaml_file(self.file_path)
+        data["fund"].append({"name": "b"})
+        data["bank"] = []
+
+        self.assertEqual(parse_yaml_file(self.file_path), {"fund": [{"name": "a"}]})
+
+    def test_parse_missing_file(self):
+        self.assertIsNone(parse_yaml_file(os.path.join(self.temp_dir, "missing.yaml")))
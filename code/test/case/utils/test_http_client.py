@@ -13,14 +13,37 @@
 @Desc    :  utils.http_client 测试类
 """
 
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 from utils.http_client import HttpClient
+from utils.rate_limiter import TokenBucket
+
+
+class _RateLimitedHandler(BaseHTTPRequestHandler):
+    """前两次请求返回 429 (Retry-After 很长), 之后返回 200"""
+    protocol_version = "HTTP/1.1"
+    request_count = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        _RateLimitedHandler.request_count += 1
+        status_code = 429 if _RateLimitedHandler.request_count < 3 else 200
+        self.send_response(status_code)
+        self.send_header("Retry-After", "3600")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
 
 
 class TestHttpClient(unittest.TestCase):
-    def setUp(self):
-        self.client = HttpClient()
+    @classmethod
+    def setUpClass(cls):
+        cls.client = HttpClient()
 
     def test_get_request(self):
         print("test get method")
@@ -33,3 +56,22 @@ class TestHttpClient(unittest.TestCase):
         response = self.client.post("https://httpbin.org/post", data={"key": "value"})
         self.assertIsNotNone(response)
         print(response.data)
+
+    def test_post_retry_on_429(self):
+        _RateLimitedHandler.request_count = 0
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _RateLimitedHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/"
+            # 默认不重试
+            self.assertFalse(HttpClient().post(url, data={"key": "value"}).is_success())
+
+            # Retry-After 被 max_backoff 截断, 不会等待 3600 秒
+            client = HttpClient(rate_limiter=TokenBucket(rate=5, capacity=5), max_retries=3, max_backoff=0.05)
+            response = client.post(url, data={"key": "value"})
+            self.assertTrue(response.is_success())
+            self.assertEqual(response.data, "ok")
+            self.assertEqual(_RateLimitedHandler.request_count, 3)
+        finally:
+            server.shutdown()
+            server.server_close()
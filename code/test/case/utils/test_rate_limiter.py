@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+"""
+@Author  :  lcx29
+
+@Software:  PyCharm
+
+@File    :  test_rate_limiter.py
+
+@Time    :  2025-08-16 10:40:05
+
+@Desc    :  utils.rate_limiter 测试类
+"""
+
+import time
+import unittest
+
+from utils.rate_limiter import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_within_capacity(self):
+        bucket = TokenBucket(rate=5, capacity=5)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.1)
+
+    def test_acquire_blocks_when_empty(self):
+        bucket = TokenBucket(rate=10, capacity=1)
+        bucket.acquire()
+        start = time.monotonic()
+        bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+    def test_invalid_config(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0, capacity=5)